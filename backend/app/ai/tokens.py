@@ -0,0 +1,14 @@
+import tiktoken
+
+try:
+    encoding = tiktoken.get_encoding("o200k_base")  # gpt-4.1 tokenizer
+    print("Successfully initialized the tokenizer.")
+except Exception as e:
+    print(f"Error initializing the tokenizer: {e}")
+    encoding = None
+
+def count_tokens(text: str) -> int:
+    """Counts the tokens in a text, falling back to a ~4 chars/token estimate."""
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi.responses import StreamingResponse
 from typing import List
 from app.db.vectorstore import vector_store
 from app.db.mongodb import chunks_collection, documents_collection
@@ -6,6 +7,7 @@ from app.schemas.models import DocumentInput, DocumentResponse
 from app.utils.serializers import serialize_doc
 from bson import ObjectId
 from app.services.document_service import process_and_index_files
+from app.services.snapshot_service import export_snapshot, import_snapshot
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
@@ -34,6 +36,31 @@ def list_documents(limit: int = 10):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/snapshot")
+def download_snapshot():
+    """
+    Streams a binary snapshot of the documents and their embedded chunks.
+    Restore it with POST /documents/snapshot instead of re-uploading the vault.
+    """
+    return StreamingResponse(
+        export_snapshot(),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": 'attachment; filename="obsidian_rag.snapshot"'}
+    )
+
+@router.post("/snapshot")
+def restore_snapshot(file: UploadFile = File(...)):
+    """
+    Bulk-loads a snapshot without re-embedding any chunk.
+    Documents and chunks that already exist are skipped.
+    """
+    try:
+        return import_snapshot(file.file)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.delete("/reset")
 def reset_database():
     """
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from app.schemas.models import QueryInput
 from app.services.rag_service import get_rag_agent 
+from app.services.session_service import load_session, build_history, record_turn
 
 router = APIRouter(prefix="/query", tags=["query"])
 
@@ -8,27 +9,40 @@ router = APIRouter(prefix="/query", tags=["query"])
 def query_rag_system(payload: QueryInput):
     """
     Performs a RAG query using the agent with tool access.
+    The conversation history is kept server-side in the session identified by `session_id`.
     
     Args:
-        payload: Contains the user's question
+        payload: Contains the user's question and optional session id
         
     Returns:
-        The agent's response
+        The agent's response and the session id to send with follow-up questions
     """
     try:
         # Get the agent
         agent = get_rag_agent()
         
+        # Prepend the bounded session history to the user's question
+        session = load_session(payload.session_id)
+        history = build_history(session)
+        messages = history + [{"role": "user", "content": payload.question}]
+
         # Invoke the agent with the user's question
-        response = agent.invoke({"messages": [{"role": "user", "content": payload.question}]})
+        response = agent.invoke({"messages": messages})
         
         # Extract the final answer from agent response
         # The exact structure depends on your LangGraph setup
         answer = response["messages"][-1].content if response.get("messages") else str(response)
+
+        # A failed summary or session write must not cost the user the answer
+        try:
+            record_turn(session, payload.question, answer, response.get("messages", [])[len(messages):])
+        except Exception as e:
+            print(f"Error saving session {session['_id']}: {e}")
         
         return {
             "question": payload.question,
-            "answer": answer
+            "answer": answer,
+            "session_id": session["_id"]
         }
         
     except Exception as e:
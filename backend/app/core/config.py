@@ -11,7 +11,19 @@ class Settings(BaseSettings):
     DB_NAME: str = "obsidian_rag"
     CHUNKS_COLLECTION_NAME: str = "chunks"
     DOCUMENTS_COLLECTION_NAME: str = "documents"
+    SESSIONS_COLLECTION_NAME: str = "sessions"
     INDEX_NAME: str = "vector_index"
+    EMBEDDING_DIMENSIONS: int = 3072 # text-embedding-3-large
+    EMBEDDING_KEY: str = "embedding"
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY")
 
+    # Context assembly for the retrieval tool
+    CONTEXT_TOKEN_BUDGET: int = 1500
+    CONTEXT_FETCH_K: int = 20
+    CONTEXT_MMR_LAMBDA: float = 0.7
+
+    # Conversation sessions
+    SESSION_TTL_SECONDS: int = 60 * 60 * 24
+    HISTORY_TOKEN_BUDGET: int = 2000
+
 settings = Settings()
@@ -34,18 +34,33 @@ def init_db():
                 print(f"Error creating collection: {e}")
                 return
 
+        if settings.SESSIONS_COLLECTION_NAME in existing_collections:
+            print(f"Collection '{settings.SESSIONS_COLLECTION_NAME}' already exists.")
+        else:
+            try:
+                db.create_collection(settings.SESSIONS_COLLECTION_NAME)
+                print(f"Collection '{settings.SESSIONS_COLLECTION_NAME}' created successfully.")
+            except CollectionInvalid as e:
+                print(f"Error creating collection: {e}")
+                return
+
+        # Sessions expire once they have been idle for SESSION_TTL_SECONDS
+        try:
+            db[settings.SESSIONS_COLLECTION_NAME].create_index(
+                "updated_at", expireAfterSeconds=settings.SESSION_TTL_SECONDS
+            )
+        except OperationFailure as e:
+            print(f"Operation failed when creating session TTL index: {e}")
+
         collection = db[settings.CHUNKS_COLLECTION_NAME]
 
         # 2. Create Vector Search Index
-        # Field name for embeddings. 
-        embedding_field = "embedding" 
-        
         index_definition = {
             "fields": [
                 {
                     "type": "vector",
-                    "path": embedding_field,
-                    "numDimensions": 3072, # text-embedding-3-large
+                    "path": settings.EMBEDDING_KEY,
+                    "numDimensions": settings.EMBEDDING_DIMENSIONS,
                     "similarity": "cosine"
                 }
             ]
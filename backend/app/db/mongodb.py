@@ -9,6 +9,7 @@ try:
     db = client[settings.DB_NAME]
     chunks_collection = db[settings.CHUNKS_COLLECTION_NAME]
     documents_collection = db[settings.DOCUMENTS_COLLECTION_NAME]
+    sessions_collection = db[settings.SESSIONS_COLLECTION_NAME]
     print("Successfully connected to MongoDB.")
 except Exception as e:
     print(f"Error connecting to MongoDB: {e}")
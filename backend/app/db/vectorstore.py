@@ -7,6 +7,7 @@ try:
     vector_store = MongoDBAtlasVectorSearch(
         collection=chunks_collection,
         embedding=embeddings,
+        embedding_key=settings.EMBEDDING_KEY,
         index_name=settings.INDEX_NAME
     )
     print("Successfully initialized MongoDB Atlas Vector Search.")
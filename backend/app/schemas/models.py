@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 class DocumentInput(BaseModel):
     content: str
@@ -7,6 +7,7 @@ class DocumentInput(BaseModel):
 
 class QueryInput(BaseModel):
     question: str
+    session_id: Optional[str] = None
 
 class DocumentResponse(BaseModel):
     id: str
@@ -18,4 +19,5 @@ class DocumentResponse(BaseModel):
 class QueryResponse(BaseModel):
     question: str
     answer: str
+    session_id: str
     
\ No newline at end of file
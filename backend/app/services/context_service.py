@@ -0,0 +1,127 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from app.ai.tokens import count_tokens
+from app.core.config import settings
+from app.db.vectorstore import vector_store
+
+# Shorter shared spans are coincidence (headings, boilerplate), not splitter overlap
+MIN_OVERLAP_CHARS = 20
+
+def _unit_vectors(docs: List[Document]) -> np.ndarray:
+    """Stacks the normalized chunk embeddings; chunks without one get a zero row."""
+    vectors = np.zeros((len(docs), settings.EMBEDDING_DIMENSIONS))
+    for i, doc in enumerate(docs):
+        embedding = doc.metadata.get(settings.EMBEDDING_KEY)
+        if embedding and len(embedding) == settings.EMBEDDING_DIMENSIONS:
+            vectors[i] = embedding
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+def _overlap_length(left: str, right: str) -> int:
+    """Returns the length of the longest suffix of `left` that is also a prefix of `right`."""
+    for size in range(min(len(left), len(right)), MIN_OVERLAP_CHARS - 1, -1):
+        if left.endswith(right[:size]):
+            return size
+    return 0
+
+def _strip_overlap(text: str, selected: List[Document], parent_id) -> str:
+    """
+    Removes the spans of `text` already present in the selected chunks.
+    Neighboring chunks of the same note share `chunk_overlap` characters at their edges.
+    """
+    for doc in selected:
+        if text in doc.page_content:
+            return ""
+        if parent_id is None or doc.metadata.get("parent_id") != parent_id:
+            continue
+        head = _overlap_length(doc.page_content, text)
+        if head:
+            text = text[head:].lstrip()
+        tail = _overlap_length(text, doc.page_content)
+        if tail:
+            text = text[:-tail].rstrip()
+    return text.strip()
+
+def _format_chunk(position: int, doc: Document) -> str:
+    title = doc.metadata.get("title", "Untitled")
+    return f"[{position}] {title}\n{doc.page_content}"
+
+def format_context(docs: List[Document]) -> str:
+    """Serializes chunks for the prompt with a compact numbered citation per chunk."""
+    return "\n\n".join(_format_chunk(i, doc) for i, doc in enumerate(docs, start=1))
+
+def select_context(
+    candidates: List[Tuple[Document, float]],
+    token_budget: int,
+    lambda_mult: float,
+) -> List[Document]:
+    """
+    Picks chunks by Maximal Marginal Relevance until the token budget is filled.
+    Duplicate and overlapping spans are dropped before a chunk is charged to the budget.
+
+    Args:
+        candidates: (document, relevance score) pairs, embeddings in the metadata
+        token_budget: Maximum tokens of serialized context
+        lambda_mult: Trade-off between relevance (1.0) and diversity (0.0)
+    """
+    if not candidates:
+        return []
+
+    docs = [doc for doc, _ in candidates]
+    scores = np.array([score for _, score in candidates], dtype=float)
+    unit = _unit_vectors(docs)
+    has_embedding = unit.any(axis=1)
+    # Highest similarity to any selected chunk, updated as chunks get selected
+    redundancy = np.zeros(len(docs))
+    available = np.ones(len(docs), dtype=bool)
+
+    selected: List[Document] = []
+    retrieved_texts: List[str] = []
+    used_tokens = 0
+
+    while available.any() and used_tokens < token_budget:
+        mmr = lambda_mult * scores - (1 - lambda_mult) * redundancy
+        mmr[~available] = -np.inf
+        best = int(np.argmax(mmr))
+        available[best] = False
+        doc = docs[best]
+
+        # The same passage can live in several notes (copied snippets, templates)
+        if any(doc.page_content in other for other in retrieved_texts):
+            continue
+
+        metadata = {key: value for key, value in doc.metadata.items() if key != settings.EMBEDDING_KEY}
+        text = _strip_overlap(doc.page_content, selected, metadata.get("parent_id"))
+        if not text:
+            continue
+
+        chunk = Document(page_content=text, metadata=metadata)
+        cost = count_tokens(_format_chunk(len(selected) + 1, chunk))
+        if used_tokens + cost > token_budget:
+            continue
+
+        selected.append(chunk)
+        retrieved_texts.append(doc.page_content)
+        used_tokens += cost
+        if has_embedding[best]:
+            # Atlas reports cosine relevance as (1 + cos) / 2, keep both terms on that scale
+            similarity = (1 + unit @ unit[best]) / 2
+            redundancy = np.where(has_embedding, np.maximum(redundancy, similarity), redundancy)
+
+    return selected
+
+def build_context(query: str, token_budget: Optional[int] = None) -> Tuple[str, List[Document]]:
+    """Over-fetches candidates for a query and assembles a deduplicated, diverse context."""
+    candidates = vector_store.similarity_search_with_score(
+        query, k=settings.CONTEXT_FETCH_K, include_embeddings=True
+    )
+    docs = select_context(
+        candidates,
+        token_budget=token_budget or settings.CONTEXT_TOKEN_BUDGET,
+        lambda_mult=settings.CONTEXT_MMR_LAMBDA,
+    )
+    return format_context(docs), docs
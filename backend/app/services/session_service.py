@@ -0,0 +1,137 @@
+import uuid
+from datetime import datetime, timezone
+from typing import List
+
+from langchain_core.documents import Document
+
+from app.ai.llm import chat_model
+from app.ai.tokens import count_tokens
+from app.core.config import settings
+from app.db.mongodb import sessions_collection
+from app.services.context_service import format_context
+
+def load_session(session_id: str = None) -> dict:
+    """Returns the stored session, or a fresh one if the id is unknown or expired."""
+    if session_id:
+        session = sessions_collection.find_one({"_id": session_id})
+        if session:
+            return session
+    return {"_id": str(uuid.uuid4()), "summary": "", "messages": [], "chunks": []}
+
+def _session_chunks(session: dict) -> List[Document]:
+    return [Document(page_content=chunk["page_content"], metadata=chunk["metadata"]) for chunk in session["chunks"]]
+
+def build_history(session: dict) -> List[dict]:
+    """
+    Builds the messages that precede the new question:
+    the rolling summary, the notes retrieved so far and the recent turns.
+    """
+    history = []
+    if session["summary"]:
+        history.append({
+            "role": "system",
+            "content": f"Summary of the earlier conversation:\n{session['summary']}"
+        })
+    if session["chunks"]:
+        history.append({
+            "role": "system",
+            "content": (
+                "Notes already retrieved in this conversation. Answer follow-up questions from them "
+                "and only use the tool again when they do not cover the question:\n\n"
+                + format_context(_session_chunks(session))
+            )
+        })
+    history.extend(session["messages"])
+    return history
+
+def _retrieved_chunks(new_messages: list) -> List[Document]:
+    """Collects the documents returned by tool calls, most recent retrieval first."""
+    docs = []
+    for message in reversed(new_messages):
+        if getattr(message, "type", None) == "tool" and getattr(message, "artifact", None):
+            docs.extend(message.artifact)
+
+    # Several retrievals in one turn may exceed the budget a single one respects
+    kept, used_tokens = [], 0
+    for doc in docs:
+        cost = count_tokens(doc.page_content)
+        if used_tokens + cost > settings.CONTEXT_TOKEN_BUDGET:
+            break
+        kept.append(doc)
+        used_tokens += cost
+    return kept
+
+def _summarize(summary: str, messages: List[dict], max_words: int) -> str:
+    """Folds older turns into the rolling summary."""
+    transcript = "\n".join(f"{message['role']}: {message['content']}" for message in messages)
+    prompt = (
+        "Update the summary of a conversation between a user and an assistant answering questions "
+        "about the user's Obsidian notes. Keep facts, names and open questions; drop pleasantries. "
+        f"Write at most {max_words} words.\n\n"
+        f"Current summary:\n{summary or '(empty)'}\n\n"
+        f"New turns:\n{transcript}\n\n"
+        "Updated summary:"
+    )
+    # The word limit keeps it short, max_tokens only guards against a runaway answer
+    return chat_model.invoke(prompt, max_tokens=max_words * 3).content
+
+def _compact(session: dict) -> None:
+    """
+    Folds older turns into the summary once the history exceeds HISTORY_TOKEN_BUDGET.
+    It compacts down to about half the budget, so several turns fit before the next compaction.
+    The latest question/answer pair is always kept verbatim for follow-ups.
+    """
+    budget = settings.HISTORY_TOKEN_BUDGET
+    messages = session["messages"]
+    total = count_tokens(session["summary"]) + sum(count_tokens(m["content"]) for m in messages)
+    if total <= budget:
+        return
+
+    # A quarter of the budget for the summary, a quarter for the recent turns
+    kept, kept_tokens = messages[-2:], sum(count_tokens(m["content"]) for m in messages[-2:])
+    for message in reversed(messages[:-2]):
+        cost = count_tokens(message["content"])
+        if kept_tokens + cost > budget // 4:
+            break
+        kept.insert(0, message)
+        kept_tokens += cost
+
+    folded = messages[:len(messages) - len(kept)]
+    if not folded:
+        return
+    # ~0.75 words per token
+    session["summary"] = _summarize(session["summary"], folded, max_words=budget // 4 * 3 // 4)
+    session["messages"] = kept
+
+def record_turn(session: dict, question: str, answer: str, new_messages: list) -> None:
+    """
+    Appends a question/answer turn to the session and persists it.
+
+    Args:
+        session: Session loaded with `load_session`
+        question: The user's question
+        answer: The agent's final answer
+        new_messages: Messages the agent produced this turn, used to cache retrieved notes
+    """
+    session["messages"].append({"role": "user", "content": question})
+    session["messages"].append({"role": "assistant", "content": answer})
+    try:
+        _compact(session)
+    except Exception as e:
+        # Save the uncompacted history, the next turn retries the summary
+        print(f"Error summarizing session {session['_id']}: {e}")
+
+    retrieved = _retrieved_chunks(new_messages)
+    if retrieved:
+        session["chunks"] = [{"page_content": doc.page_content, "metadata": doc.metadata} for doc in retrieved]
+
+    sessions_collection.update_one(
+        {"_id": session["_id"]},
+        {"$set": {
+            "summary": session["summary"],
+            "messages": session["messages"],
+            "chunks": session["chunks"],
+            "updated_at": datetime.now(timezone.utc)
+        }},
+        upsert=True
+    )
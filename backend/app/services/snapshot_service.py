@@ -0,0 +1,147 @@
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Iterator, List
+
+import bson
+from bson.errors import InvalidBSON
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.db.init_db import init_db
+from app.db.mongodb import chunks_collection, documents_collection
+
+# Snapshot layout (little-endian):
+#   header: MAGIC, uint32 embedding dimensions
+#   record: 1-byte kind, uint32 BSON length, BSON body
+#           chunk records are followed by the embedding as packed float32
+#   footer: END_RECORD
+MAGIC = b"OBSNAP\x01"
+DOCUMENT_RECORD = b"D"
+CHUNK_RECORD = b"C"
+END_RECORD = b"E"
+
+BATCH_SIZE = 1000
+FLUSH_BYTES = 1 << 20
+DUPLICATE_KEY_ERROR = 11000
+
+def _pack_vector(vector: List[float]) -> bytes:
+    packed = array("f", vector)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+def _unpack_vector(data: bytes) -> List[float]:
+    packed = array("f")
+    packed.frombytes(data)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tolist()
+
+def _record(kind: bytes, body: dict) -> bytes:
+    encoded = bson.encode(body)
+    return kind + struct.pack("<I", len(encoded)) + encoded
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise ValueError("Snapshot is truncated.")
+    return data
+
+def export_snapshot() -> Iterator[bytes]:
+    """
+    Streams the documents and chunks collections as a binary snapshot.
+    Embeddings are stored as packed float32 so restoring needs no embedding calls.
+    """
+    dimensions = settings.EMBEDDING_DIMENSIONS
+    buffer = bytearray(MAGIC + struct.pack("<I", dimensions))
+
+    for doc in documents_collection.find({}, batch_size=BATCH_SIZE):
+        buffer += _record(DOCUMENT_RECORD, doc)
+        if len(buffer) >= FLUSH_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+
+    for chunk in chunks_collection.find({}, batch_size=BATCH_SIZE):
+        vector = chunk.pop(settings.EMBEDDING_KEY, None)
+        if vector is None or len(vector) != dimensions:
+            print(f"Skipping chunk {chunk['_id']}: missing or mismatched embedding.")
+            continue
+        buffer += _record(CHUNK_RECORD, chunk) + _pack_vector(vector)
+        if len(buffer) >= FLUSH_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+
+    buffer += END_RECORD
+    yield bytes(buffer)
+
+def _insert_batch(collection: Collection, batch: List[dict]) -> int:
+    """Bulk inserts a batch, skipping records whose _id already exists. Returns the inserted count."""
+    if not batch:
+        return 0
+    try:
+        return len(collection.insert_many(batch, ordered=False).inserted_ids)
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if any(error.get("code") != DUPLICATE_KEY_ERROR for error in errors):
+            raise
+        return e.details.get("nInserted", 0)
+
+def import_snapshot(stream: BinaryIO) -> dict:
+    """
+    Bulk-loads a snapshot written by `export_snapshot` and rebuilds the search index.
+    Records already in the database are skipped.
+
+    Args:
+        stream: Binary file-like object positioned at the start of the snapshot
+
+    Returns:
+        Read and inserted counts per collection
+    """
+    header = _read_exact(stream, len(MAGIC) + 4)
+    if header[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a snapshot file.")
+    dimensions = struct.unpack("<I", header[len(MAGIC):])[0]
+    if dimensions != settings.EMBEDDING_DIMENSIONS:
+        raise ValueError(
+            f"Snapshot has {dimensions}-dimensional embeddings, index expects {settings.EMBEDDING_DIMENSIONS}."
+        )
+
+    counts = {"documents_read": 0, "documents_inserted": 0, "chunks_read": 0, "chunks_inserted": 0}
+    documents, chunks = [], []
+
+    while True:
+        kind = _read_exact(stream, 1)
+        if kind == END_RECORD:
+            break
+        if kind not in (DOCUMENT_RECORD, CHUNK_RECORD):
+            raise ValueError(f"Unknown snapshot record {kind!r}.")
+
+        length = struct.unpack("<I", _read_exact(stream, 4))[0]
+        try:
+            record = bson.decode(_read_exact(stream, length))
+        except InvalidBSON:
+            raise ValueError("Snapshot is corrupt.")
+
+        if kind == DOCUMENT_RECORD:
+            documents.append(record)
+            counts["documents_read"] += 1
+            if len(documents) >= BATCH_SIZE:
+                counts["documents_inserted"] += _insert_batch(documents_collection, documents)
+                documents = []
+        else:
+            record[settings.EMBEDDING_KEY] = _unpack_vector(_read_exact(stream, dimensions * 4))
+            chunks.append(record)
+            counts["chunks_read"] += 1
+            if len(chunks) >= BATCH_SIZE:
+                counts["chunks_inserted"] += _insert_batch(chunks_collection, chunks)
+                chunks = []
+
+    counts["documents_inserted"] += _insert_batch(documents_collection, documents)
+    counts["chunks_inserted"] += _insert_batch(chunks_collection, chunks)
+
+    # Creates the collections and vector index if this is a fresh cluster.
+    # An existing index picks up the inserted chunks on its own.
+    init_db()
+    return counts
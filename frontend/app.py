@@ -59,6 +59,10 @@ with tab_chat:
     if "messages" not in st.session_state:
         st.session_state.messages = []
 
+    # The backend keeps the conversation history for this session
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = None
+
     for message in st.session_state.messages:
         with chat_container.chat_message(message["role"]):
             st.markdown(message["content"])
@@ -76,10 +80,14 @@ with tab_chat:
         with chat_container.chat_message("assistant"):
             with st.spinner("Thinking..."):
                 try:
-                    response = requests.post(QUERY_ENDPOINT, json={"question": prompt})
+                    response = requests.post(
+                        QUERY_ENDPOINT,
+                        json={"question": prompt, "session_id": st.session_state.session_id}
+                    )
                     response.raise_for_status()
 
                     response_data = response.json()
+                    st.session_state.session_id = response_data.get("session_id")
                     full_response = response_data.get("answer", "Sorry, I didn't get a valid answer.")
 
                     st.markdown(full_response)